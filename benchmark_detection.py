@@ -0,0 +1,67 @@
+# benchmark_detection.py
+"""
+Compare the per-frame cost of the detection engines on identical input.
+
+Frames are captured once (from the webcam, or from a video file given on the
+command line) and then replayed through every engine with the original
+capture timestamps (the file's own timestamps for a video), so each engine
+sees exactly the same motion. Frames are kept at camera resolution and
+prepared inside the timed loop, as the detector does.
+
+    python benchmark_detection.py [video_file] [frame_count]
+"""
+import sys
+import time
+import cv2
+import jump_detection
+
+ENGINES = ("cascade", "motion")
+
+
+def capture_frames(source, frame_count):
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        print(f"Error: Could not open {source!r}!")
+        return []
+
+    from_file = isinstance(source, str)
+    frames = []
+    while len(frames) < frame_count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000 if from_file else time.time()
+        frames.append((timestamp, frame))
+    cap.release()
+    return frames
+
+
+def run_engine(name, frames):
+    engine = jump_detection.create_engine(name)
+    jumps = 0
+    start = time.perf_counter()
+    for timestamp, frame in frames:
+        events = engine.process(jump_detection.prepare_frame(frame), timestamp)
+        jumps += sum(1 for event in events if event[0] == "jump")
+    elapsed = time.perf_counter() - start
+    return elapsed, jumps
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else 0
+    frame_count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    print(f"Capturing {frame_count} frames...")
+    frames = capture_frames(source, frame_count)
+    if not frames:
+        return
+
+    print(f"{'engine':<10}{'ms/frame':>10}{'fps':>10}{'jumps':>8}")
+    for name in ENGINES:
+        elapsed, jumps = run_engine(name, frames)
+        ms_per_frame = elapsed / len(frames) * 1000
+        print(f"{name:<10}{ms_per_frame:>10.2f}{1000 / ms_per_frame:>10.1f}{jumps:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,12 @@ GRAVITY = 0.5              # Gravity per fixed update step
 MAX_JUMP_FORCE = 30        # Maximum jump force (as detected)
 JUMP_COOLDOWN_MS = 400     # Cooldown in milliseconds between jumps
 MAX_FALL_SPEED = 25        # Terminal velocity
+FRAME_PACING = "sleep"     # "sleep" (clock.tick) or "latched" (wait on the jump queue until the frame is due)
+
+# Player constants (used by game_main.py and level_analyzer.py)
+PLAYER_WIDTH = 30
+PLAYER_HEIGHT = 50
+PLAYER_SPEED = 5           # Horizontal speed given by a jump
 
 # Platform constants
 PLATFORM_SIZE = 64         # Width/height of a platform block
@@ -28,7 +34,31 @@ PLATFORM_MARGIN = 4        # Margin used for collision resolution horizontally
 COLLISION_PADDING = 2      # Padding from platform when landing
 
 # Jump detection constants (used by jump_detection.py)
+DETECTION_ENGINE = "cascade"        # "cascade" (Haar face + CSRT) or "motion" (face-free optical flow)
 DETECTION_SCALE_FACTOR = 1.4
-DETECTION_VELOCITY_THRESHOLD = 130  # Minimum velocity (after regression) to trigger a jump
+DETECTION_VELOCITY_THRESHOLD = 130  # Minimum filtered upward face velocity (px/s) to trigger a jump
+DETECTION_REARM_FRACTION = 0.6      # After a jump, |velocity| must stay below threshold * this ...
+DETECTION_REARM_TIME = 0.15         # ... for this many seconds before the next jump can trigger
 DETECTION_COOLDOWN = 0.25           # In seconds
 JUMP_FORCE_SCALE = 600              # Scale factor applied to computed velocity to get jump force
+
+# Camera preview
+CAMERA_PREVIEW = "window"           # "window" (separate OpenCV window) or "pygame" (picture-in-picture in the game)
+CAMERA_PREVIEW_SIZE = (240, 180)    # Size of the in-game preview
+CAMERA_PREVIEW_FPS = 15             # How often the in-game preview picks up a new frame
+
+# Motion engine constants (DETECTION_ENGINE = "motion")
+MOTION_FRAME_WIDTH = 160            # Frames are downscaled to this width before differencing
+MOTION_DIFF_THRESHOLD = 25          # Per-pixel grey level change that counts as motion
+MOTION_MIN_AREA = 0.01              # Fraction of the frame that must move before we look at flow
+MOTION_MAX_CORNERS = 40             # Feature points tracked by optical flow per frame
+MOTION_VELOCITY_THRESHOLD = 250     # Upward velocity (display px/s) needed to trigger a jump
+MOTION_FORCE_SCALE = 12             # Jump force = velocity / moving body height * this
+
+# Kalman filter constants (face position smoothing in the cascade engine)
+KALMAN_ORDER = 2                    # 2: constant velocity, 3: constant acceleration
+KALMAN_PROCESS_NOISE = 1.5e4        # White acceleration density (px^2/s^3) for order 2; higher reacts faster, smooths less
+KALMAN_TRACKER_NOISE = 9            # CSRT measurement variance (px^2)
+KALMAN_CASCADE_NOISE = 64           # Haar cascade measurement variance (px^2)
+KALMAN_CONFIDENT_STD = 4            # Position std (px) below which the cascade runs half as often
+KALMAN_MAX_PREDICT_STD = 40         # Position std (px) beyond which prediction is abandoned
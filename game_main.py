@@ -7,15 +7,16 @@ from collections import deque
 import os
 import state  # our pause flag
 import main
+import config
 
 # (Player, ParallaxBackground, load_textures, and load_level remain unchanged)
 class Player:
     def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 30, 50)
+        self.rect = pygame.Rect(x, y, config.PLAYER_WIDTH, config.PLAYER_HEIGHT)
         self.velocity = pygame.math.Vector2(0, 0)
         self.facing = 'right'
         self.is_grounded = False
-        self.speed = 5
+        self.speed = config.PLAYER_SPEED
         self.friction = 0.7
         self.sprite_right = pygame.image.load(main.resource_path(os.path.join('textures', 'player_right.png')))
         self.sprite_left = pygame.image.load(main.resource_path(os.path.join('textures', 'player_left.png')))
@@ -83,6 +84,49 @@ class ParallaxBackground:
 
         screen.blit(self.image, (draw_x, draw_y))
 
+class CameraPreview:
+    """Picture-in-picture view of the detector's camera frames."""
+    def __init__(self, size, fps, screen_width, screen_height, margin=10):
+        self.size = size
+        self.interval = 1000 / fps
+        self.rect = pygame.Rect(screen_width - size[0] - margin, screen_height - size[1] - margin, *size)
+        self.font = pygame.font.SysFont(None, 24)
+        self.source = None
+        self.surface = None
+        self.overlays = []
+        self.scale = (1, 1)
+        self.last_update = None
+
+    def update(self, now):
+        preview = state.camera_preview
+        if preview is None or preview is self.source:
+            return
+        if self.last_update is not None and now - self.last_update < self.interval:
+            return
+        frame, overlays = preview
+        height, width = frame.shape[:2]
+        # Wrap the detector's BGR buffer directly; the only pixel work is the downscale.
+        camera_surface = pygame.image.frombuffer(frame.data, (width, height), "BGR")
+        self.surface = pygame.transform.scale(camera_surface, self.size)
+        self.scale = (self.size[0] / width, self.size[1] / height)
+        self.overlays = overlays
+        self.source = preview
+        self.last_update = now
+
+    def draw(self, screen):
+        if self.surface is None:
+            return
+        screen.blit(self.surface, self.rect)
+        sx, sy = self.scale
+        for kind, value, color in self.overlays:
+            if kind == "rect":
+                x, y, w, h = value
+                box = pygame.Rect(self.rect.x + x * sx, self.rect.y + y * sy, w * sx, h * sy)
+                pygame.draw.rect(screen, color, box.clip(self.rect), 2)
+            elif kind == "text":
+                screen.blit(self.font.render(value, True, color), (self.rect.x + 5, self.rect.y + 5))
+        pygame.draw.rect(screen, (0, 0, 0), self.rect, 2)
+
 # Modified game_main.py sections
 
 def render_text_with_outline(surface, text, font, text_color, outline_color, position):
@@ -111,20 +155,21 @@ def load_level(filename):
     start_x = 100
     start_y = 100
     found_start = False
+    tile = config.PLATFORM_SIZE
     
     with open(filename, 'r') as f:
         for y, line in enumerate(f):
             for x, char in enumerate(line.strip()):
                 if char in ('G', 'P', 'S', 'W', 'E'):  # Added 'E' for end trigger
-                    if (x * 64) % 64 == 0 and (y * 64) % 64 == 0:
-                        platform = pygame.Rect(x*64, y*64, 64, 64)
+                    if (x * tile) % tile == 0 and (y * tile) % tile == 0:
+                        platform = pygame.Rect(x*tile, y*tile, tile, tile)
                         if char == 'G':
                             walls.append(platform)
                         elif char == 'S':
                             start_platforms.append(platform)
                             if not found_start:
-                                start_x = x*64 + (64 - 30) // 2
-                                start_y = y*64 - 50
+                                start_x = x*tile + (tile - config.PLAYER_WIDTH) // 2
+                                start_y = y*tile - config.PLAYER_HEIGHT
                                 found_start = True
                         elif char == 'E':  # Handle end trigger areas
                             end_triggers.append(platform)
@@ -200,6 +245,78 @@ def format_time(seconds):
     milliseconds = int((seconds % 1) * 100)
     return f"{minutes:02d}:{seconds:02d}.{milliseconds:02d}"
 
+def wait_for_messages(jump_queue, deadline):
+    """Block on the jump queue until `deadline` (time.perf_counter seconds).
+
+    Returns early as soon as a jump arrives, so it can be applied this frame
+    instead of after a blind sleep. Anything else already queued is drained too.
+    """
+    messages = []
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            msg = jump_queue.get(timeout=remaining)
+        except queue.Empty:
+            break
+        messages.append(msg)
+        if isinstance(msg, tuple) and msg[0] == "jump":
+            break
+    messages.extend(drain_messages(jump_queue))
+    return messages
+
+def drain_messages(jump_queue):
+    messages = []
+    try:
+        while True:
+            messages.append(jump_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return messages
+
+def move_player(player, solids, end_triggers, level_width, level_height, delta_time):
+    """Advance the player by one frame of gravity, friction and collisions.
+
+    Collisions resolve against the first of `solids` the player overlaps.
+    Returns True if the player touched an end trigger. level_analyzer replays
+    this step offline; `python level_analyzer.py --check` compares the two.
+    """
+    player.velocity.y = min(player.velocity.y + config.GRAVITY * delta_time * 60, config.MAX_FALL_SPEED)
+
+    if player.is_grounded:
+        player.velocity.x *= player.friction ** (delta_time * 60)
+        if abs(player.velocity.x) < 0.5:
+            player.velocity.x = 0
+
+    player.rect.x += player.velocity.x
+    for obj in solids:
+        if player.rect.colliderect(obj):
+            if player.velocity.x > 0:
+                player.rect.right = obj.left - config.PLATFORM_MARGIN
+            elif player.velocity.x < 0:
+                player.rect.left = obj.right + config.PLATFORM_MARGIN
+            player.velocity.x = 0
+            break
+
+    player.rect.y += player.velocity.y
+    player.is_grounded = False
+    for obj in solids:
+        if player.rect.colliderect(obj):
+            if player.velocity.y > 0:
+                player.rect.bottom = obj.top - config.COLLISION_PADDING
+                player.is_grounded = True
+            elif player.velocity.y < 0:
+                player.rect.top = obj.bottom + config.COLLISION_PADDING
+            player.velocity.y = 0
+            break
+
+    touched_end = player.rect.collidelist(end_triggers) != -1
+
+    player.rect.x = max(0, min(player.rect.x, level_width - player.rect.width))
+    player.rect.y = max(0, min(player.rect.y, level_height - player.rect.height))
+    return touched_end
+
 def pause_menu(screen, clock, screen_width, screen_height):
     # Set pause flag so jump detection stops
     import state
@@ -247,12 +364,8 @@ def start_game(jump_queue, shutdown_event):
     pygame.display.set_caption("JIJI")
     WHITE = (255, 255, 255)
     
-    GRAVITY = 0.5
-    MAX_JUMP_FORCE = 30
-    JUMP_COOLDOWN = 400  # ms
-    COLLISION_PADDING = 2
-    PLATFORM_MARGIN = 4
-    MAX_FALL_SPEED = 25
+    MAX_JUMP_FORCE = config.MAX_JUMP_FORCE
+    JUMP_COOLDOWN = config.JUMP_COOLDOWN_MS
 
     textures = load_textures()
     platforms, walls, start_platforms, end_triggers, start_x, start_y = load_level(main.resource_path('level4.txt'))
@@ -262,9 +375,10 @@ def start_game(jump_queue, shutdown_event):
     jump_force_buffer = deque(maxlen=3)
     last_jump_time = 0
     
+    solids = platforms + walls + start_platforms
     all_objects = platforms + walls + start_platforms + end_triggers
-    level_width = max(p.x for p in all_objects) + 64 if all_objects else 800
-    level_height = max(p.y for p in all_objects) + 64 if all_objects else 600
+    level_width = max(p.x for p in all_objects) + config.PLATFORM_SIZE if all_objects else 800
+    level_height = max(p.y for p in all_objects) + config.PLATFORM_SIZE if all_objects else 600
     background = ParallaxBackground(
         os.path.join('textures', 'background.png'),
         screen_width,
@@ -288,9 +402,33 @@ def start_game(jump_queue, shutdown_event):
     # Font for timer display
     timer_font = pygame.font.SysFont(None, 36)
 
+    camera_preview = None
+    if config.CAMERA_PREVIEW == "pygame":
+        camera_preview = CameraPreview(config.CAMERA_PREVIEW_SIZE, config.CAMERA_PREVIEW_FPS,
+                                       screen_width, screen_height)
+
+    latched = config.FRAME_PACING == "latched"
+    frame_interval = 1 / 60
+    next_frame_due = time.perf_counter()
+    # Time jump messages spent in jump_queue. Direction updates arrive every
+    # detector frame and are not worth timing, so they are left out.
+    jump_delay_count = 0
+    jump_delay_total = 0.0
+    jump_delay_max = 0.0
+
     running = True
     while running and not shutdown_event.is_set():
-        delta_time = clock.tick(60) / 1000.0
+        if latched:
+            messages = wait_for_messages(jump_queue, next_frame_due)
+            delta_time = clock.tick() / 1000.0
+            frame_start = time.perf_counter()
+            if frame_start - next_frame_due > frame_interval:
+                next_frame_due = frame_start + frame_interval  # Fell behind (e.g. paused); don't catch up
+            else:
+                next_frame_due += frame_interval
+        else:
+            delta_time = clock.tick(60) / 1000.0
+            messages = None
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -325,19 +463,22 @@ def start_game(jump_queue, shutdown_event):
             player.update_sprite()
 
             current_time = pygame.time.get_ticks()
-            try:
-                while True:
-                    msg = jump_queue.get_nowait()
-                    if isinstance(msg, tuple):
-                        if msg[0] == "direction":
-                            player.facing = msg[1]
-                        elif msg[0] == "jump":
-                            force, direction = msg[1], msg[2]
-                            player.facing = direction
-                            if 5 <= force <= MAX_JUMP_FORCE:
-                                jump_force_buffer.append(force)
-            except queue.Empty:
-                pass
+            if messages is None:
+                messages = drain_messages(jump_queue)
+            for msg in messages:
+                if isinstance(msg, tuple):
+                    if msg[0] == "direction":
+                        player.facing = msg[1]
+                    elif msg[0] == "jump":
+                        force, direction = msg[1], msg[2]
+                        delay = time.perf_counter() - msg[-1]
+                        jump_delay_count += 1
+                        jump_delay_total += delay
+                        jump_delay_max = max(jump_delay_max, delay)
+                        print(f"Jump (force {force:.1f}) spent {delay * 1000:.1f} ms in the queue")
+                        player.facing = direction
+                        if 5 <= force <= MAX_JUMP_FORCE:
+                            jump_force_buffer.append(force)
 
             if jump_force_buffer and player.is_grounded:
                 if (current_time - last_jump_time) > JUMP_COOLDOWN:
@@ -348,44 +489,9 @@ def start_game(jump_queue, shutdown_event):
                     last_jump_time = current_time
                     jump_force_buffer.clear()
 
-            player.velocity.y = min(player.velocity.y + GRAVITY * delta_time * 60, MAX_FALL_SPEED)
-            
-            if player.is_grounded:
-                player.velocity.x *= player.friction ** (delta_time * 60)
-                if abs(player.velocity.x) < 0.5:
-                    player.velocity.x = 0
-
-            player.rect.x += player.velocity.x
-            for obj in platforms + walls + start_platforms:
-                if player.rect.colliderect(obj):
-                    if player.velocity.x > 0:
-                        player.rect.right = obj.left - PLATFORM_MARGIN
-                    elif player.velocity.x < 0:
-                        player.rect.left = obj.right + PLATFORM_MARGIN
-                    player.velocity.x = 0
-                    break
-
-            player.rect.y += player.velocity.y
-            player.is_grounded = False
-            for obj in platforms + walls + start_platforms:
-                if player.rect.colliderect(obj):
-                    if player.velocity.y > 0:
-                        player.rect.bottom = obj.top - COLLISION_PADDING
-                        player.is_grounded = True
-                    elif player.velocity.y < 0:
-                        player.rect.top = obj.bottom + COLLISION_PADDING
-                    player.velocity.y = 0
-                    break
-
-            # Check for collision with end triggers
-            for end_trigger in end_triggers:
-                if player.rect.colliderect(end_trigger):
-                    level_completed = True
-                    completion_time = time.time() - start_time - total_pause_time
-                    break
-
-            player.rect.x = max(0, min(player.rect.x, level_width - player.rect.width))
-            player.rect.y = max(0, min(player.rect.y, level_height - player.rect.height))
+            if move_player(player, solids, end_triggers, level_width, level_height, delta_time):
+                level_completed = True
+                completion_time = time.time() - start_time - total_pause_time
 
             target_x = player.rect.centerx - screen_width // 2
             target_y = player.rect.centery - screen_height // 2
@@ -453,6 +559,10 @@ def start_game(jump_queue, shutdown_event):
             (screen_width - 20, 20)  # Position (top right)
         )
 
+        if camera_preview is not None:
+            camera_preview.update(pygame.time.get_ticks())
+            camera_preview.draw(screen)
+
         pygame.display.flip()
         
         # Show completion screen if level is completed
@@ -462,4 +572,8 @@ def start_game(jump_queue, shutdown_event):
                 shutdown_event.set()
                 running = False
 
+    if jump_delay_count:
+        average_ms = jump_delay_total / jump_delay_count * 1000
+        print(f"Jump queue latency over {jump_delay_count} jumps: "
+              f"avg {average_ms:.1f} ms, max {jump_delay_max * 1000:.1f} ms")
     pygame.quit()
\ No newline at end of file
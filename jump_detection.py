@@ -1,8 +1,9 @@
 # jump_detection.py
 import cv2
 import time
-from collections import deque
 import numpy as np
+import config
+from kalman import KalmanFilter1D
 import state  # import our pause flag
 import os
 import sys
@@ -18,131 +19,277 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-scale_factor = 1.4
+scale_factor = config.DETECTION_SCALE_FACTOR
 
-def start_jump_detection(jump_queue, shutdown_event):
-    print("Starting jump detection with enhanced motion tracking...")
-    
-    cv2.namedWindow("Jump Detection", cv2.WINDOW_GUI_NORMAL)
 
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("Error: Could not open camera!")
-        return
-    
+def load_face_cascade():
     # WHEN RUNNING PROGRAM:
-    face_cascade = cv2.CascadeClassifier(
+    return cv2.CascadeClassifier(
         cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
     )
     # WHEN BUILDING THE EXE:
     # cascade_path = resource_path("cv2/data/haarcascade_frontalface_default.xml")
-    # face_cascade = cv2.CascadeClassifier(cascade_path)
-    
-    tracker = None
-    detection_interval = 8
-    frame_count = 0
-    lost_track_frames = 0
-    
-    position_history = deque(maxlen=20)
-    last_detection_time = time.time()
-    velocity_threshold = 130
-    cooldown = 0.25
-    
-    last_velocity = 0
-    predicted_pos = None
+    # return cv2.CascadeClassifier(cascade_path)
 
-    while not shutdown_event.is_set():
-        ret, frame = cap.read()
-        if not ret:
-            break
 
-        frame = cv2.flip(frame, 1)
-        new_width = int(frame.shape[1] * scale_factor)
-        new_height = int(frame.shape[0] * scale_factor)
-        frame = cv2.resize(frame, (new_width, new_height))
-        cv2.resizeWindow("Jump Detection", new_width, new_height)
-        
-        current_time = time.time()
+class CascadeEngine:
+    """Haar cascade face detection, tracked between detections with CSRT.
+
+    Both sources feed a Kalman filter; jumps are decided on its filtered
+    velocity, and it bridges short tracking losses by prediction.
+    """
+
+    def __init__(self, face_cascade):
+        self.face_cascade = face_cascade
+        self.tracker = None
+        self.detection_interval = 8
+        self.frame_count = 0
+        self.lost_track_frames = 0
+
+        self.last_detection_time = float("-inf")  # No cooldown before the first jump
+        self.velocity_threshold = config.DETECTION_VELOCITY_THRESHOLD
+        self.cooldown = config.DETECTION_COOLDOWN
+
+        self.kf = KalmanFilter1D(config.KALMAN_PROCESS_NOISE, config.KALMAN_ORDER)
+        self.trigger_armed = False  # Armed once the head has been still for a moment
+        self.calm_since = None
+        self.bbox = None
+        self.face_found = False
+        self.predicting = False
+        self.facing_direction = "right"
+
+    def current_detection_interval(self):
+        # A confident filter lets the tracker run longer between cascade passes.
+        if self.kf.position_std < config.KALMAN_CONFIDENT_STD:
+            return self.detection_interval * 2
+        return self.detection_interval
+
+    def process(self, frame, current_time):
+        """Run one frame through the detector and return the events it produced."""
+        events = []
         face_found = False
-        y_pos = None
-        
-        if tracker is not None:
-            success, bbox = tracker.update(frame)
+        self.kf.predict(current_time)
+
+        if self.tracker is not None:
+            success, bbox = self.tracker.update(frame)
             if success:
                 x, y, w, h = [int(v) for v in bbox]
+                self.bbox = (x, y, w, h)
                 face_found = True
-                y_pos = y + h//2
-                frame_count += 1
-                lost_track_frames = 0
-                
-                if len(position_history) > 1:
-                    last_velocity = (position_history[-1][1] - y_pos) / (current_time - position_history[-1][0])
+                self.kf.update(y + h//2, config.KALMAN_TRACKER_NOISE)
+                self.frame_count += 1
+                self.lost_track_frames = 0
             else:
-                lost_track_frames += 1
-                if lost_track_frames < 3 and predicted_pos is not None:
-                    y_pos = int(predicted_pos)
-                    face_found = True
-                if lost_track_frames >= 3:
-                    tracker = None
-
-        if not face_found or frame_count >= detection_interval:
+                self.lost_track_frames += 1
+                if self.lost_track_frames >= 3:
+                    self.tracker = None
+
+        if not face_found or self.frame_count >= self.current_detection_interval():
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = face_cascade.detectMultiScale(
-                gray, 
+            faces = self.face_cascade.detectMultiScale(
+                gray,
                 scaleFactor=1.1,
                 minNeighbors=5,
                 minSize=(50, 50))
-            
+
             if len(faces) > 0:
                 x, y, w, h = max(faces, key=lambda f: f[2]*f[3])
-                tracker = cv2.TrackerCSRT_create()
-                tracker.init(frame, (x, y, w, h))
+                self.tracker = cv2.TrackerCSRT_create()
+                self.tracker.init(frame, (x, y, w, h))
+                self.bbox = (x, y, w, h)
                 face_found = True
-                y_pos = y + h//2
-                frame_count = 0
-                lost_track_frames = 0
+                self.kf.update(y + h//2, config.KALMAN_CASCADE_NOISE)
+                self.frame_count = 0
+                self.lost_track_frames = 0
 
+        self.face_found = face_found
         if face_found:
+            x, y, w, h = self.bbox
             frame_center_x = frame.shape[1] // 2
             face_center_x = x + w // 2
-            facing_direction = "left" if face_center_x < frame_center_x else "right"
-            if not state.paused:  # Only add to the queue when not paused
-                jump_queue.put(("direction", facing_direction))
-            position_history.append((current_time, y_pos))
-            predicted_pos = y_pos + last_velocity * (1/30)
-        elif predicted_pos is not None:
-            position_history.append((current_time, int(predicted_pos)))
-            predicted_pos += last_velocity * (1/30)
-
-        if len(position_history) >= 2:
-            cutoff = current_time - 0.2
-            valid_entries = [p for p in position_history if p[0] >= cutoff]
-            
-            if len(valid_entries) >= 2:
-                times = np.array([p[0] for p in valid_entries])
-                y_positions = np.array([p[1] for p in valid_entries])
-                coeffs = np.polyfit(times, y_positions, 1)
-                velocity = -coeffs[0]
-
-                if (velocity > velocity_threshold and 
-                    (current_time - last_detection_time) > cooldown):
-                    face_size = w * h if face_found else 2500
-                    jump_force = min((velocity / face_size) * 800, 20)
-                    if not state.paused:
-                        jump_queue.put(("jump", jump_force, facing_direction))
-                    last_detection_time = current_time
-                    position_history.clear()
+            self.facing_direction = "left" if face_center_x < frame_center_x else "right"
+            events.append(("direction", self.facing_direction))
+        elif self.kf.position_std > config.KALMAN_MAX_PREDICT_STD:
+            # Prediction has drifted too far to be useful; start over on the next face.
+            self.kf.reset()
+            self.trigger_armed = False
 
-        if face_found:
-            cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-        elif predicted_pos is not None:
-            cv2.putText(frame, "PREDICTING", (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-        
+        self.predicting = not face_found and self.kf.initialized
+        if self.kf.initialized:
+            velocity = -self.kf.velocity  # Image y grows downwards
+
+            # Fire on the upward crossing only, and re-arm once the head has been
+            # still for a moment: one jump keeps the filtered velocity high for
+            # longer than the cooldown, and straightening up from the landing
+            # squat is upward motion too.
+            if abs(velocity) < self.velocity_threshold * config.DETECTION_REARM_FRACTION:
+                if self.calm_since is None:
+                    self.calm_since = current_time
+                if current_time - self.calm_since >= config.DETECTION_REARM_TIME:
+                    self.trigger_armed = True
+            else:
+                self.calm_since = None
+            if (self.trigger_armed and velocity > self.velocity_threshold and
+                (current_time - self.last_detection_time) > self.cooldown):
+                face_size = self.bbox[2] * self.bbox[3] if face_found else 2500
+                jump_force = min((velocity / face_size) * 800, 20)
+                events.append(("jump", jump_force, self.facing_direction))
+                self.last_detection_time = current_time
+                self.trigger_armed = False
+                self.calm_since = None
+
+        return events
+
+    def overlays(self):
+        if self.face_found:
+            return [("rect", self.bbox, config.GREEN)]
+        if self.predicting:
+            return [("text", "PREDICTING", config.RED)]
+        return []
+
+
+class MotionEngine:
+    """Face-free detector: sparse optical flow restricted to a frame-difference mask.
+
+    Works on a small greyscale copy of the frame, so it costs a fraction of the
+    cascade + CSRT path and keeps working when the player turns away.
+    """
+
+    def __init__(self):
+        self.prev_gray = None
+        self.prev_time = None
+        self.last_detection_time = float("-inf")  # No cooldown before the first jump
+        self.velocity_threshold = config.MOTION_VELOCITY_THRESHOLD
+        self.cooldown = config.DETECTION_COOLDOWN
+        self.facing_direction = "right"
+        self.motion_box = None  # (x, y, w, h) in display frame coordinates
+
+    def process(self, frame, current_time):
+        """Run one frame through the detector and return the events it produced."""
+        events = []
+        scale = config.MOTION_FRAME_WIDTH / frame.shape[1]
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+
+        prev_gray, prev_time = self.prev_gray, self.prev_time
+        self.prev_gray, self.prev_time = gray, current_time
+        self.motion_box = None
+        if prev_gray is None or current_time <= prev_time:
+            return events
+
+        diff = cv2.absdiff(prev_gray, gray)
+        _, mask = cv2.threshold(diff, config.MOTION_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY)
+        mask = cv2.dilate(mask, None, iterations=2)
+        if cv2.countNonZero(mask) < config.MOTION_MIN_AREA * mask.size:
+            return events
+
+        bx, by, bw, bh = cv2.boundingRect(mask)
+        self.motion_box = tuple(int(v / scale) for v in (bx, by, bw, bh))
+        moments = cv2.moments(mask, binaryImage=True)
+        motion_center_x = moments["m10"] / moments["m00"]
+        self.facing_direction = "left" if motion_center_x < mask.shape[1] / 2 else "right"
+        events.append(("direction", self.facing_direction))
+
+        points = cv2.goodFeaturesToTrack(prev_gray, maxCorners=config.MOTION_MAX_CORNERS,
+                                         qualityLevel=0.01, minDistance=5, mask=mask)
+        if points is None:
+            return events
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None,
+                                                          winSize=(15, 15), maxLevel=2)
+        tracked = status.ravel() == 1
+        if not tracked.any():
+            return events
+
+        dy = np.median(new_points[tracked, 0, 1] - points[tracked, 0, 1])
+        velocity = -dy / scale / (current_time - prev_time)  # display px/s, upwards positive
+
+        if (velocity > self.velocity_threshold and
+            (current_time - self.last_detection_time) > self.cooldown):
+            body_height = max(self.motion_box[3], 1)
+            jump_force = min((velocity / body_height) * config.MOTION_FORCE_SCALE, 20)
+            events.append(("jump", jump_force, self.facing_direction))
+            self.last_detection_time = current_time
+
+        return events
+
+    def overlays(self):
+        if self.motion_box is not None:
+            return [("rect", self.motion_box, config.BLUE)]
+        return []
+
+
+def create_engine(name=None):
+    """Build the detector engine selected by config.DETECTION_ENGINE (or `name`)."""
+    name = name or config.DETECTION_ENGINE
+    if name == "cascade":
+        return CascadeEngine(load_face_cascade())
+    if name == "motion":
+        return MotionEngine()
+    raise ValueError(f"Unknown detection engine: {name!r}")
+
+
+def prepare_frame(frame):
+    """Mirror the camera frame and scale it up to display size."""
+    frame = cv2.flip(frame, 1)
+    new_width = int(frame.shape[1] * scale_factor)
+    new_height = int(frame.shape[0] * scale_factor)
+    return cv2.resize(frame, (new_width, new_height))
+
+
+def draw_overlays(frame, overlays):
+    """Draw engine overlays (RGB colours) onto a BGR frame for the HighGUI window."""
+    for kind, value, color in overlays:
+        color = color[::-1]
+        if kind == "rect":
+            x, y, w, h = value
+            cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+        elif kind == "text":
+            cv2.putText(frame, value, (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+
+
+def start_jump_detection(jump_queue, shutdown_event):
+    print(f"Starting jump detection with the {config.DETECTION_ENGINE} engine...")
+
+    preview_in_game = config.CAMERA_PREVIEW == "pygame"
+    if not preview_in_game:
+        cv2.namedWindow("Jump Detection", cv2.WINDOW_GUI_NORMAL)
+
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        print("Error: Could not open camera!")
+        return
+
+    engine = create_engine()
+
+    while not shutdown_event.is_set():
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        frame = prepare_frame(frame)
+
+        events = engine.process(frame, time.time())
+        if not state.paused:  # Only add to the queue when not paused
+            for event in events:
+                # Stamp with the enqueue time so the game can report queueing latency.
+                jump_queue.put(event + (time.perf_counter(),))
+
+        if preview_in_game:
+            # Hand the buffer to the game as-is; this frame is never written to again,
+            # so the game can wrap it without copying and draws the overlays itself.
+            state.camera_preview = (frame, engine.overlays())
+            continue
+
+        draw_overlays(frame, engine.overlays())
+        cv2.resizeWindow("Jump Detection", frame.shape[1], frame.shape[0])
         cv2.imshow("Jump Detection", frame)
         if cv2.waitKey(1) & 0xFF == ord('q'):
             shutdown_event.set()
             break
 
     cap.release()
-    cv2.destroyAllWindows()
+    state.camera_preview = None
+    if not preview_in_game:
+        cv2.destroyAllWindows()
@@ -0,0 +1,83 @@
+# kalman.py
+import math
+import numpy as np
+
+
+class KalmanFilter1D:
+    """Kinematic Kalman filter for one image coordinate.
+
+    With order=2 the state is [position, velocity] (constant velocity); with
+    order=3 acceleration is added (constant acceleration). Time steps come from
+    the real frame timestamps passed to predict(), so the filter does not
+    assume a frame rate. Each update() takes its own measurement variance,
+    which lets the CSRT tracker and the Haar cascade be fused with different
+    confidence.
+    """
+
+    def __init__(self, process_noise, order=2, initial_velocity_var=1e4, initial_acceleration_var=1e6):
+        self.process_noise = process_noise  # Spectral density of the white noise driving the highest derivative
+        self.order = order
+        self.initial_var = [initial_velocity_var, initial_acceleration_var][:order - 1]
+        self.reset()
+
+    def reset(self):
+        self.x = np.zeros(self.order)
+        self.P = np.eye(self.order)
+        self.last_time = None
+        self.initialized = False
+
+    def predict(self, timestamp):
+        """Advance the state to `timestamp` (seconds)."""
+        if not self.initialized:
+            self.last_time = timestamp
+            return
+        dt = timestamp - self.last_time
+        self.last_time = timestamp
+        if dt <= 0:
+            return
+
+        n = self.order
+        F = np.zeros((n, n))
+        Q = np.zeros((n, n))
+        for i in range(n):
+            for j in range(n):
+                if j >= i:
+                    F[i, j] = dt**(j - i) / math.factorial(j - i)
+                # Discretized white noise on the first derivative not in the state,
+                # e.g. [[dt^3/3, dt^2/2], [dt^2/2, dt]] for constant velocity.
+                power = 2 * n - 1 - i - j
+                Q[i, j] = dt**power / (power * math.factorial(n - 1 - i) * math.factorial(n - 1 - j))
+        self.x = F @ self.x
+        self.P = F @ self.P @ F.T + self.process_noise * Q
+
+    def update(self, measurement, measurement_var):
+        """Fuse a position measurement with variance `measurement_var` (px^2)."""
+        if not self.initialized:
+            self.x = np.zeros(self.order)
+            self.x[0] = measurement
+            self.P = np.diag([measurement_var] + self.initial_var)
+            self.initialized = True
+            return
+
+        # H = [1, 0, ...], so the innovation covariance and gain reduce to the first column of P.
+        innovation = measurement - self.x[0]
+        s = self.P[0, 0] + measurement_var
+        K = self.P[:, 0] / s
+        self.x = self.x + K * innovation
+        self.P = self.P - np.outer(K, self.P[0, :])
+
+    @property
+    def position(self):
+        return self.x[0]
+
+    @property
+    def velocity(self):
+        return self.x[1]
+
+    @property
+    def position_std(self):
+        return float(np.sqrt(self.P[0, 0])) if self.initialized else float("inf")
+
+    @property
+    def velocity_std(self):
+        return float(np.sqrt(self.P[1, 1])) if self.initialized else float("inf")
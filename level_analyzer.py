@@ -0,0 +1,496 @@
+# level_analyzer.py
+"""
+Offline reachability analysis for level files.
+
+Jump arcs only depend on the jump force, the player speed, GRAVITY and
+MAX_FALL_SPEED, so they are computed once per force and cached together with
+the tiles each arc sweeps. Every jump from every standable tile is then
+simulated at once with numpy: the cached arcs are checked against the grid in
+bulk to skip each jump's free flight, and the rest is stepped frame by frame
+with the same integration and collision rules as game_main.move_player at
+60 fps, including pygame's rounding of rect positions and the ceiling
+load_level adds to levels without one. A graph search from the 'S' tile over
+the resulting landings gives reachability and minimum forces.
+
+A jump always starts from the centre of the tile the player stands on; the
+slide after landing is ignored.
+
+    python level_analyzer.py [-v] level4.txt [more levels...]
+    python level_analyzer.py --check level4.txt   # compare against game_main.move_player
+"""
+import math
+import sys
+from collections import deque
+from functools import lru_cache
+import numpy as np
+import config
+
+TILE = config.PLATFORM_SIZE
+PLAYER_W = config.PLAYER_WIDTH
+PLAYER_H = config.PLAYER_HEIGHT
+SOLID_TILES = ("G", "P", "S", "W")
+# game_main collides against platforms ('P', 'W'), then walls ('G', then the
+# ceiling), then start platforms, and resolves against the first hit.
+COLLISION_ORDER = {"P": 0, "W": 0, "G": 1, "S": 2}
+CEILING = (0, 0, 800, 10)  # x, y, width, height of the ceiling rect load_level adds
+END_TILE = "E"
+EMPTY = " "
+OUTSIDE = "#"  # Anything beyond the level bounds
+
+# Where the player's rect sits relative to the top-left of the tile it stands on.
+START_OFFSET_X = (TILE - PLAYER_W) // 2
+START_OFFSET_Y = -config.COLLISION_PADDING - PLAYER_H
+
+MAX_SIM_FRAMES = 2000
+NO_HIT = np.iinfo(np.int64).max
+SWEEP_CHUNK = 32  # Swept tiles tested per numpy pass when looking for first contact
+
+
+class Level:
+    def __init__(self, lines):
+        # Mirror game_main.load_level, which strips every line before indexing it.
+        self.lines = [line.strip() for line in lines]
+        objects = [(x, y) for y, line in enumerate(self.lines)
+                   for x, char in enumerate(line) if char in SOLID_TILES + (END_TILE,)]
+        self.cols = max(x for x, _ in objects) + 1 if objects else 0
+        self.rows = max(y for _, y in objects) + 1 if objects else 0
+        self.pixel_width = self.cols * TILE
+        self.pixel_height = self.rows * TILE
+        self.start = next(((x, y) for x, y in objects if self.lines[y][x] == "S"), None)
+        self.grid = [line[:self.cols].ljust(self.cols) for line in self.lines[:self.rows]]
+        # load_level adds a ceiling unless the top row has a platform or wall.
+        self.ceiling = not any(char in ("G", "P", "W") for char in self.grid[0]) if self.grid else True
+
+        # Flat row-major tile arrays, padded by one tile on every side so player
+        # rects hanging over the level edge index safely.
+        self.stride = self.cols + 2
+        size = self.stride * (self.rows + 2)
+        # Solids get keys in the order game_main tests them, so the first hit is the minimum.
+        self.key_span = size + 1
+        self.collision_keys = np.full(size, NO_HIT, dtype=np.int64)
+        self.ceiling_key = COLLISION_ORDER["G"] * self.key_span + size  # After every 'G' wall
+        self.end_tiles = np.zeros(size, dtype=bool)
+        # What a free-flight arc cannot be skipped past: any non-empty tile, the
+        # ceiling, and the padding, where the game clamps the player.
+        self.blocked = np.ones(size, dtype=bool)
+        for y, line in enumerate(self.grid):
+            for x, char in enumerate(line):
+                index = (y + 1) * self.stride + x + 1
+                self.blocked[index] = char != EMPTY
+                if char in SOLID_TILES:
+                    self.collision_keys[index] = COLLISION_ORDER[char] * self.key_span + index
+                elif char == END_TILE:
+                    self.end_tiles[index] = True
+        if self.ceiling and self.rows:
+            ceiling_cols = min((CEILING[0] + CEILING[2] - 1) // TILE + 1, self.cols)
+            self.blocked[self.stride + 1:self.stride + 1 + ceiling_cols] = True
+
+    @classmethod
+    def from_file(cls, filename):
+        with open(filename, 'r') as f:
+            return cls(f.read().splitlines())
+
+    def tile(self, col, row):
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.grid[row][col]
+        return OUTSIDE
+
+    def is_solid(self, col, row):
+        return self.tile(col, row) in SOLID_TILES
+
+    def standable_tiles(self):
+        """Every solid tile with room for the player above it."""
+        return {(x, y) for y in range(self.rows) for x in range(self.cols)
+                if self.is_solid(x, y) and self.tile(x, y - 1) in (EMPTY, END_TILE)}
+
+    def tile_index(self, cols, rows):
+        """Flat indices of tiles (arrays); anything outside the level maps onto the padding."""
+        return (np.clip(rows, -1, self.rows) + 1) * self.stride + np.clip(cols, -1, self.cols) + 1
+
+    def tile_coords(self, index):
+        """Inverse of tile_index for tiles inside the level."""
+        return index % self.stride - 1, index // self.stride - 1
+
+
+def jump_forces(min_force=5, max_force=config.MAX_JUMP_FORCE, step=1.0):
+    """Discretized forces accepted by the game (5 <= force <= MAX_JUMP_FORCE)."""
+    count = int(round((max_force - min_force) / step)) + 1
+    return [min_force + i * step for i in range(count)]
+
+
+@lru_cache(maxsize=None)
+def trajectory(force, max_drop, speed=config.PLAYER_SPEED):
+    """Free-flight arc of a jump as (dx, dy, vy) after each frame, relative to take-off.
+
+    The arc stops once it has fallen `max_drop` pixels below take-off. Offsets
+    assume the player stays at x, y >= 0, where pygame's rounding is round half up.
+    """
+    frames = []
+    x = y = 0
+    vy = -force
+    while y <= max_drop and len(frames) < MAX_SIM_FRAMES:
+        vy = min(vy + config.GRAVITY, config.MAX_FALL_SPEED)
+        x += math.floor(speed + 0.5)
+        y += math.floor(vy + 0.5)
+        frames.append((x, y, vy))
+    return tuple(frames)
+
+
+@lru_cache(maxsize=None)
+def _arc_table(force, max_drop, speed):
+    """A trajectory as numpy arrays, plus the tiles it sweeps from a standing start.
+
+    Returns (dx, dy, vy, sweep_frames, sweep_cols, sweep_rows). The first three
+    are indexed by frame, take-off included. The sweep lists every tile, relative
+    to the one taken off from, that the player rect reaches, with the first frame
+    whose horizontal or vertical move reaches it, in frame order. The rect is
+    widened by a pixel on every side, so that reaching the level edges (where
+    pygame's rounding and the floor clamp need exact stepping) counts as contact.
+    """
+    arc = ((0, 0, -force),) + trajectory(force, max_drop, speed)
+    dx, dy, vy = (np.array(values) for values in zip(*arc))
+
+    swept = {}
+    def sweep(frame, x, y):
+        for row in range((y - 1) // TILE, (y + PLAYER_H) // TILE + 1):
+            for col in range((x - 1) // TILE, (x + PLAYER_W) // TILE + 1):
+                swept.setdefault((col, row), frame)
+
+    sweep(1, START_OFFSET_X, START_OFFSET_Y)
+    for frame in range(1, len(arc)):
+        x = START_OFFSET_X + arc[frame][0]
+        sweep(frame, x, START_OFFSET_Y + arc[frame - 1][1])
+        sweep(frame, x, START_OFFSET_Y + arc[frame][1])
+    sweep_cols = np.array([col for col, _ in swept], dtype=np.int64)
+    sweep_rows = np.array([row for _, row in swept], dtype=np.int64)
+    return dx, dy, vy, np.array(list(swept.values())), sweep_cols, sweep_rows
+
+
+def _first_contact(level, cols, rows, table):
+    """First frame at which the arc from each take-off tile reaches a blocked tile.
+
+    Frames before it are pure free flight and can be taken from the table.
+    """
+    _, _, _, frames, sweep_cols, sweep_rows = table
+    first = np.full(len(cols), len(table[0]) - 1)
+    active = np.arange(len(cols))
+    for start in range(0, len(frames), SWEEP_CHUNK):
+        chunk = slice(start, start + SWEEP_CHUNK)
+        blocked = level.blocked[level.tile_index(cols[active, None] + sweep_cols[chunk],
+                                                 rows[active, None] + sweep_rows[chunk])]
+        hit = blocked.any(axis=1)
+        first[active[hit]] = frames[chunk][blocked[hit].argmax(axis=1)]
+        active = active[~hit]
+        if not len(active):
+            break
+    return first
+
+
+def _rect_coords(values):
+    """Round coordinates the way assigning a float to a pygame.Rect does (half away from zero)."""
+    rounded = np.floor(values + 0.5)
+    rounded[(values < 0) & (rounded - values == 0.5)] -= 1  # -2.5 -> -3, not -2
+    return rounded.astype(np.int64)
+
+
+def _corner_indices(level, x, y):
+    """Flat indices of the tiles under the four corners of player rects at (x, y).
+
+    The player is smaller than a tile, so these are all the tiles it overlaps;
+    touching edges do not count, matching pygame's Rect.colliderect. Rects can
+    be well outside the level before the game clamps them (taking off from an
+    'S' on the top row starts above it), so anything outside maps onto the
+    padding, as in Level.tile_index.
+    """
+    left = np.clip(x // TILE, -1, level.cols) + 1
+    right = np.clip((x + (PLAYER_W - 1)) // TILE, -1, level.cols) + 1
+    top = (np.clip(y // TILE, -1, level.rows) + 1) * level.stride
+    bottom = (np.clip((y + (PLAYER_H - 1)) // TILE, -1, level.rows) + 1) * level.stride
+    return top + left, top + right, bottom + left, bottom + right
+
+
+def _first_hits(level, corners, x, y):
+    """Collision key of the solid each player rect resolves against, or NO_HIT."""
+    keys = level.collision_keys
+    a, b, c, d = corners
+    hits = np.minimum(np.minimum(keys[a], keys[b]), np.minimum(keys[c], keys[d]))
+    if level.ceiling:
+        cx, cy, cw, ch = CEILING
+        under = (x < cx + cw) & (x + PLAYER_W > cx) & (y < cy + ch) & (y + PLAYER_H > cy)
+        hits[under] = np.minimum(hits[under], level.ceiling_key)
+    return hits
+
+
+def _hit_bounds(level, hits):
+    """(left, top, right, bottom) of the solids behind collision keys."""
+    left, top = level.tile_coords(hits % level.key_span)
+    left, top = left * TILE, top * TILE
+    right, bottom = left + TILE, top + TILE
+    if level.ceiling:
+        ceiling = hits == level.ceiling_key
+        cx, cy, cw, ch = CEILING
+        left[ceiling], top[ceiling], right[ceiling], bottom[ceiling] = cx, cy, cx + cw, cy + ch
+    return left, top, right, bottom
+
+
+def _touches_end(level, corners):
+    ends = level.end_tiles
+    a, b, c, d = corners
+    return ends[a] | ends[b] | ends[c] | ends[d]
+
+
+def _step_jumps(level, x, y, vx, vy, frame):
+    """Step many jumps at once, frame by frame, exactly like game_main.move_player.
+
+    Takes equal-length arrays of player positions, velocities and frames
+    already flown. A jump ends when it lands, when it rests on the level floor
+    clamp (never grounded), or after MAX_SIM_FRAMES. Returns arrays of the
+    landing tile's flat index (-1 if none), whether 'E' was touched, and the
+    final position.
+    """
+    landed = np.full(len(x), -1, dtype=np.int64)
+    reached_end = np.zeros(len(x), dtype=bool)
+    final_x, final_y = x.copy(), y.copy()
+    vx, frame = vx.astype(float), frame.copy()
+    floor_y = level.pixel_height - PLAYER_H
+    max_x = level.pixel_width - PLAYER_W
+
+    jobs = np.arange(len(x))
+    while len(jobs):
+        frame += 1
+        vy = np.minimum(vy + config.GRAVITY, config.MAX_FALL_SPEED)
+
+        # Collisions are rare on any one frame, so they are resolved on the jobs that hit only.
+        x = _rect_coords(x + vx)
+        hits = _first_hits(level, _corner_indices(level, x, y), x, y)
+        hit = np.flatnonzero(hits != NO_HIT)
+        if len(hit):
+            left, _, right, _ = _hit_bounds(level, hits[hit])
+            hit_vx = vx[hit]
+            x[hit] = np.where(hit_vx > 0, left - config.PLATFORM_MARGIN - PLAYER_W,
+                              np.where(hit_vx < 0, right + config.PLATFORM_MARGIN, x[hit]))
+            vx[hit] = 0
+
+        y = _rect_coords(y + vy)
+        corners = _corner_indices(level, x, y)
+        hits = _first_hits(level, corners, x, y)
+        hit = np.flatnonzero(hits != NO_HIT)
+        grounded = np.zeros(len(jobs), dtype=bool)
+        touched_end = _touches_end(level, corners)
+        if len(hit):
+            _, top, _, bottom = _hit_bounds(level, hits[hit])
+            hit_vy = vy[hit]
+            grounded[hit] = hit_vy > 0
+            y[hit] = np.where(hit_vy > 0, top - config.COLLISION_PADDING - PLAYER_H,
+                              np.where(hit_vy < 0, bottom + config.COLLISION_PADDING, y[hit]))
+            vy[hit] = 0
+            touched_end[hit] = _touches_end(level, _corner_indices(level, x[hit], y[hit]))
+        reached_end[jobs[touched_end]] = True
+
+        np.maximum(np.minimum(x, max_x, out=x), 0, out=x)
+        np.maximum(np.minimum(y, floor_y, out=y), 0, out=y)
+        done = grounded | (y == floor_y) | (frame >= MAX_SIM_FRAMES)
+        if done.any():
+            on_tile = grounded & (hits != level.ceiling_key)
+            landed[jobs[on_tile]] = hits[on_tile] % level.key_span
+            final_x[jobs[done]], final_y[jobs[done]] = x[done], y[done]
+            keep = ~done
+            jobs, x, y, vx, vy, frame = jobs[keep], x[keep], y[keep], vx[keep], vy[keep], frame[keep]
+    return landed, reached_end, final_x, final_y
+
+
+def simulate_jumps(level, tiles, jumps):
+    """Jump from standing on each of `tiles` with each (force, direction) in `jumps`.
+
+    Returns (landed, reached_end, final_x, final_y) arrays of shape
+    (len(tiles), len(jumps)); landed holds flat tile indices, -1 for no landing.
+    """
+    cols = np.array([col for col, _ in tiles], dtype=np.int64)
+    rows = np.array([row for _, row in tiles], dtype=np.int64)
+    shape = (len(jumps), len(tiles))
+    x, y, frame = np.empty(shape, np.int64), np.empty(shape, np.int64), np.empty(shape, np.int64)
+    vx, vy = np.empty(shape), np.empty(shape)
+    for j, (force, direction) in enumerate(jumps):
+        speed = direction * config.PLAYER_SPEED
+        table = _arc_table(force, level.pixel_height, speed)
+        dx, dy, arc_vy = table[:3]
+        # Skip straight to the frame before first contact, then step exactly.
+        frame[j] = _first_contact(level, cols, rows, table) - 1
+        x[j] = cols * TILE + START_OFFSET_X + dx[frame[j]]
+        y[j] = rows * TILE + START_OFFSET_Y + dy[frame[j]]
+        vx[j] = speed
+        vy[j] = arc_vy[frame[j]]
+    results = _step_jumps(level, x.ravel(), y.ravel(), vx.ravel(), vy.ravel(), frame.ravel())
+    return tuple(result.reshape(shape).T for result in results)
+
+
+def simulate_jump(level, tile, force, direction):
+    """Jump from standing on `tile` with `force` towards `direction` (-1 or 1).
+
+    Returns (landing tile or None, whether an end trigger was touched).
+    """
+    landed, reached_end, _, _ = simulate_jumps(level, [tile], [(force, direction)])
+    if landed[0, 0] < 0:
+        return None, bool(reached_end[0, 0])
+    col, row = level.tile_coords(int(landed[0, 0]))
+    return (col, row), bool(reached_end[0, 0])
+
+
+class LevelAnalysis:
+    def __init__(self, level):
+        self.level = level
+        self.reachable = set()
+        self.transitions = {}  # (from_tile, to_tile) -> (min_force, direction)
+        self.end_jumps = {}    # from_tile -> (min_force, direction) that touches 'E'
+
+    @property
+    def end_reachable(self):
+        return bool(self.end_jumps)
+
+    @property
+    def unreachable(self):
+        return self.level.standable_tiles() - self.reachable
+
+    def route(self):
+        """Fewest-jumps list of (force, direction) from 'S' to 'E', or None."""
+        start = self.level.start
+        if start is None:
+            return None
+        adjacency = {}
+        for src, dst in self.transitions:
+            adjacency.setdefault(src, []).append(dst)
+
+        parents = {start: None}
+        pending = deque([start])
+        while pending:
+            tile = pending.popleft()
+            if tile in self.end_jumps:
+                path = [self.end_jumps[tile]]
+                while parents[tile] is not None:
+                    previous = parents[tile]
+                    path.append(self.transitions[(previous, tile)])
+                    tile = previous
+                return path[::-1]
+            for dst in adjacency.get(tile, []):
+                if dst not in parents:
+                    parents[dst] = tile
+                    pending.append(dst)
+        return None
+
+
+def analyze_level(level, forces=None):
+    """Search every tile reachable from 'S' by jumping.
+
+    Jumps from every standable tile are simulated up front in one batch; a
+    landing on any other solid tile is simulated when the search reaches it.
+    """
+    forces = jump_forces() if forces is None else sorted(forces)
+    analysis = LevelAnalysis(level)
+    if level.start is None:
+        return analysis
+
+    # Ordered by force, so the first jump reaching a tile is the weakest one.
+    jumps = [(force, direction) for force in forces for direction in (-1, 1)]
+    outcomes = {}  # tile -> (landing tile index per jump, reached 'E' per jump)
+
+    def simulate(tiles):
+        landed, reached_end, _, _ = simulate_jumps(level, tiles, jumps)
+        outcomes.update(zip(tiles, zip(landed.tolist(), reached_end.tolist())))
+
+    simulate(sorted(level.standable_tiles() | {level.start}))
+    analysis.reachable.add(level.start)
+    pending = deque([level.start])
+    while pending:
+        tile = pending.popleft()
+        if tile not in outcomes:
+            simulate([tile])
+        landings, reached_end = outcomes[tile]
+        if True in reached_end:
+            analysis.end_jumps[tile] = jumps[reached_end.index(True)]
+        for index in dict.fromkeys(landings):
+            if index < 0:
+                continue
+            landed = level.tile_coords(index)
+            if landed == tile:
+                continue
+            analysis.transitions[(tile, landed)] = jumps[landings.index(index)]
+            if landed not in analysis.reachable:
+                analysis.reachable.add(landed)
+                pending.append(landed)
+    return analysis
+
+
+def print_report(filename, verbose=False):
+    level = Level.from_file(filename)
+    analysis = analyze_level(level)
+
+    print(f"{filename}: {level.cols}x{level.rows} tiles")
+    if level.start is None:
+        print("  No start tile 'S'")
+        return
+    print(f"  Reachable tiles: {len(analysis.reachable)}, unreachable: {len(analysis.unreachable)}")
+    if analysis.unreachable:
+        print(f"  Unreachable: {sorted(analysis.unreachable)}")
+    print(f"  End reachable: {'yes' if analysis.end_reachable else 'no'}")
+    if verbose:
+        for (src, dst), (force, direction) in sorted(analysis.transitions.items()):
+            side = "left" if direction < 0 else "right"
+            print(f"    {src} -> {dst}: force {force:g} {side}")
+    route = analysis.route()
+    if route:
+        steps = ", ".join(f"{force:g} {'left' if d < 0 else 'right'}" for force, d in route)
+        print(f"  Route ({len(route)} jumps): {steps}")
+
+
+def check_against_game(filename, forces=None):
+    """Replay every jump analyze_level simulates through game_main.move_player.
+
+    Covers every standable tile and 'S'. Prints the jumps where the analyzer
+    ends somewhere else than the game, or disagrees on landing or touching 'E',
+    and returns how many there were.
+    """
+    import game_main  # Needs pygame and the textures, unlike the analysis itself
+
+    level = Level.from_file(filename)
+    platforms, walls, start_platforms, end_triggers, _, _ = game_main.load_level(filename)
+    solids = platforms + walls + start_platforms
+    player = game_main.Player(0, 0)
+    floor_y = level.pixel_height - PLAYER_H
+    tiles = sorted(level.standable_tiles() | ({level.start} if level.start else set()))
+    jumps = [(force, direction) for direction in (-1, 1)
+             for force in (jump_forces() if forces is None else forces)]
+    landed, reached_end, final_x, final_y = simulate_jumps(level, tiles, jumps)
+
+    mismatches = 0
+    for i, (col, row) in enumerate(tiles):
+        for j, (force, direction) in enumerate(jumps):
+            player.rect.topleft = (col * TILE + START_OFFSET_X, row * TILE + START_OFFSET_Y)
+            player.velocity.update(direction * player.speed, -force)
+            player.is_grounded = False
+            touched_end = False
+            for _ in range(MAX_SIM_FRAMES):
+                if game_main.move_player(player, solids, end_triggers,
+                                         level.pixel_width, level.pixel_height, 1 / 60):
+                    touched_end = True
+                if player.is_grounded or player.rect.y == floor_y:
+                    break
+            game = (player.is_grounded, touched_end, player.rect.topleft)
+            analyzer = (bool(landed[i, j] >= 0), bool(reached_end[i, j]), (int(final_x[i, j]), int(final_y[i, j])))
+            if analyzer != game:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"  {(col, row)} force {force:g} {'left' if direction < 0 else 'right'}: "
+                          f"game (landed, end, position) {game}, analyzer {analyzer}")
+    print(f"{filename}: {mismatches} of {len(tiles) * len(jumps)} jumps differ from game_main")
+    return mismatches
+
+
+if __name__ == "__main__":
+    verbose = "-v" in sys.argv[1:]
+    check = "--check" in sys.argv[1:]
+    filenames = [arg for arg in sys.argv[1:] if arg not in ("-v", "--check")]
+    for filename in filenames or ["level1.txt", "level2.txt", "level3.txt", "level4.txt"]:
+        if check:
+            check_against_game(filename)
+        else:
+            print_report(filename, verbose)
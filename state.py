@@ -1,2 +1,3 @@
 # state.py
 paused = False
+camera_preview = None  # (frame, overlays) most recently published by the detector